@@ -79,14 +79,16 @@ class ParallelCorpus:
         src_row_filters = [
             {
                 "col_index": 0,
-                "ok_values": set(lk_dframe["sentence_id"]),
+                "ok_values": set(lk_dframe["sentence_id"].unique().tolist()),
                 "converter": int,
             }
         ]
         tgt_row_filters = [
             {
                 "col_index": 0,
-                "ok_values": set(lk_dframe["translation_id"]),
+                "ok_values": set(
+                    lk_dframe["translation_id"].unique().tolist()
+                ),
                 "converter": int,
             }
         ]
@@ -1,16 +1,52 @@
 import csv
+import errno
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from io import StringIO, TextIOBase
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 
 import pandas as pd
 from tqdm import tqdm
 
-from .utils import get_byte_size, get_extended_name
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from .utils import advise_sequential, get_extended_name
 from .version import version
 
 logger = logging.getLogger(__name__)
 
+# large reads amortize the syscalls made when streaming big data files
+READ_BUFFER_SIZE = 1 << 20
+# rows are already written by batches and many output files may be open
+WRITE_BUFFER_SIZE = 64 << 10
+# threads renaming the output files of a split in parallel
+MAX_RENAME_WORKERS = 32
+# output files kept open at most, whatever the open file limit
+MAX_OPEN_FILES = 512
+# descriptors left to the rest of the process when many files are open
+OPEN_FILES_HEADROOM = 64
+
+
+def get_max_open_files():
+    """Get how many output files may be kept open at the same time,
+    given the soft limit on the open file descriptors of the process
+    """
+    if resource is None:
+        return MAX_OPEN_FILES
+
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return MAX_OPEN_FILES
+
+    return max(1, min(MAX_OPEN_FILES, soft - OPEN_FILES_HEADROOM))
+
 
 def reset_pos(func):
     """Decorator for reseting previous position in file-like object
@@ -26,6 +62,170 @@ def reset_pos(func):
     return _reset_pos
 
 
+def custom_reader(
+    file_obj,
+    delimiter="\t",
+    quoting=csv.QUOTE_NONE,
+    quotechar="",
+    lineterminator="\n",
+    text_col=None,
+    nb_cols=None,
+):
+    """Iterate over the rows of a file object. When the expected number
+    of columns is known, the rows split by delimiter or line terminator
+    characters found in their text column are merged back together.
+    """
+    if quoting == csv.QUOTE_NONE:  # nothing for csv.reader to unquote
+        # a last text column takes in the extra delimiters of its row
+        capped = bool(nb_cols) and text_col == nb_cols - 1
+        rd = split_lines(
+            file_obj, delimiter, maxsplit=nb_cols - 1 if capped else -1
+        )
+    else:
+        capped = False
+        rd = csv.reader(
+            file_obj,
+            delimiter=delimiter,
+            quoting=quoting,
+            quotechar=quotechar or None,
+            lineterminator=lineterminator,
+        )
+    if not nb_cols:  # no way to detect split rows
+        yield from rd
+        return
+
+    row = None
+    row_len = 0
+    row_cnt = 0
+    for next_row in rd:
+        n = len(next_row)
+        if not n:  # blank line
+            continue
+        if capped and n == nb_cols and delimiter in next_row[-1]:
+            # count the fields of a capped row as if it was fully split,
+            # so that it is merged exactly like an over-long row
+            n += next_row[-1].count(delimiter)
+        if row and row_len - row_cnt + n <= nb_cols:
+            row.extend(next_row)  # cat multiline row
+            row_len += n
+            row_cnt += 1
+            continue
+        if row_len == nb_cols or (
+            row and unsplit_field(row, text_col, nb_cols)
+        ):
+            if capped and delimiter in row[text_col]:
+                row[text_col] = row[text_col].replace(delimiter, " ")
+            yield row
+        row = next_row
+        row_len = n
+        row_cnt = 1
+
+    if row_len == nb_cols or (row and unsplit_field(row, text_col, nb_cols)):
+        if capped and delimiter in row[text_col]:
+            row[text_col] = row[text_col].replace(delimiter, " ")
+        yield row
+
+
+def split_lines(file_obj, delimiter="\t", maxsplit=-1):
+    """Iterate over the rows of a file object whose fields are never
+    quoted. When the number of splits is limited, the extra delimiters
+    are left in the last field.
+    """
+    for line in file_obj:
+        line = line.rstrip("\r\n")
+        yield line.split(delimiter, maxsplit) if line else []
+
+
+def classify_rows(rows, columns, add_row, get_out_filename, fnames):
+    """Pass the rows whose split fields are all filled to 'add_row' along
+    with the name of their output file. 'fnames' memoizes the output
+    filenames by split fields across calls.
+    """
+    if len(columns) == 1:  # itemgetter returns a field, not a tuple
+        col = columns[0]
+        for row in rows:
+            try:
+                field = row[col]
+            except IndexError:
+                logger.debug(f"missing column(s) {columns} in {row}")
+                continue
+            if field:
+                try:
+                    fname = fnames[field]
+                except KeyError:
+                    fname = fnames[field] = get_out_filename((field,))
+                add_row(row, fname)
+        return
+
+    get_fields = itemgetter(*columns) if columns else lambda row: ()
+    for row in rows:
+        try:
+            fields = get_fields(row)
+        except IndexError:
+            logger.debug(f"missing column(s) {columns} in {row}")
+            continue
+        if all(fields):
+            try:
+                fname = fnames[fields]
+            except KeyError:
+                fname = fnames[fields] = get_out_filename(fields)
+            add_row(row, fname)
+
+
+@lru_cache(maxsize=None)
+def get_reader(
+    delimiter="\t",
+    quoting=csv.QUOTE_NONE,
+    quotechar="",
+    lineterminator="\n",
+    text_col=None,
+    nb_cols=None,
+):
+    """Get a function that reads the rows of a file object, specialized
+    once for these csv parameters
+    """
+    if nb_cols:
+        return partial(
+            custom_reader,
+            delimiter=delimiter,
+            quoting=quoting,
+            quotechar=quotechar,
+            lineterminator=lineterminator,
+            text_col=text_col,
+            nb_cols=nb_cols,
+        )
+    elif quoting == csv.QUOTE_NONE:
+        return partial(split_lines, delimiter=delimiter)
+    else:  # raw rows, without a generator layer on top
+        return partial(
+            csv.reader,
+            delimiter=delimiter,
+            quoting=quoting,
+            quotechar=quotechar or None,
+            lineterminator=lineterminator,
+        )
+
+
+def unsplit_field(row, text_col, nb_cols):
+    """Merge in place the extra fields of a row into its text column.
+    Return whether the row ends up with the expected number of columns.
+    """
+    nb_extra_cols = len(row) - nb_cols
+    if nb_extra_cols > 0:  # field merger required
+        if text_col is None:
+            logger.debug(f"a text column is needed to fix {row}")
+        else:  # remove all delimiters from text field
+            j = text_col + nb_extra_cols + 1
+            row[text_col] = " ".join(row[text_col:j])
+            del row[text_col + 1 : j]
+
+    if len(row) == nb_cols:
+        return True
+    else:
+        logger.debug(f"bad row: {row}")
+        return False
+
+
 class DataFile:
     """A data file handler"""
 
@@ -78,16 +278,19 @@ class DataFile:
         self._na = na_values
         self._tc = text_col
         self._nc = nb_cols
+        # the file object, which a path is only opened into when first
+        # read, so that many datafiles do not hold as many descriptors
+        self._fb = None
 
         if isinstance(file_path_or_data, Path):
-            try:
-                self._f = open(file_path_or_data, encoding="utf-8")
-            except FileNotFoundError:  # path with not file scenario
-                self._f = StringIO()
             self._fp = file_path_or_data
         elif isinstance(file_path_or_data, str):
             try:
-                self._f = open(file_path_or_data, encoding="utf-8")
+                self._f = open(
+                    file_path_or_data,
+                    buffering=READ_BUFFER_SIZE,
+                    encoding="utf-8",
+                )
             except FileNotFoundError:  # data string scenario
                 self._f = StringIO(file_path_or_data)
                 self._fp = None
@@ -115,78 +318,67 @@ class DataFile:
             data_type = type(file_path_or_data)
             raise TypeError(f"{data_type} is not a valid 'file_path_or_data'")
 
-        # init 'raw row' iterator
-        self._rd = csv.reader(
-            self._f,
+        if self._fb and self._fp:
+            advise_sequential(self._fb)
+
+        # init 'row' reader
+        self._rd = get_reader(
             delimiter=self._dm,
             quoting=self._qt,
             quotechar=self._qc,
             lineterminator=self._lt,
+            text_col=self._tc,
+            nb_cols=self._nc,
         )
-        # init 'working row' value buffer
-        self._wr = []
 
     def __del__(self):
 
-        if self._f:
-            self._f.close()
+        if self._fb:
+            self._fb.close()
 
     def __iter__(self):
-
+        # a generator method keeps this datafile, and so its file object,
+        # alive for as long as its rows are read
         self.pos = 0
 
-        return self
+        yield from self._rd(self._f)
 
-    def __next__(self):
-
-        next_row = self._wr
-        try:
-            if not next_row:  # first line
-                next_row = next(self._rd)
-            row_cnt = 1
-            while True:
-                self._wr = next(self._rd)
-                if (
-                    self._nc
-                    and len(next_row) - row_cnt + len(self._wr) <= self._nc
-                ):  # cat multiline row
-                    next_row.extend(self._wr)
-                    row_cnt += 1
-                else:
-                    break
-        except StopIteration:
-            self._wr = None
-            raise StopIteration
-        finally:
-            if not next_row:  # reset pos at the end
-                self.pos = 0
-            else:
-                if not self._nc:
-                    return next_row
-                else:
-                    nb_extra_cols = len(next_row) - self._nc
-                    if nb_extra_cols > 0:  # field merger required
-                        try:
-                            i = self._tc
-                            j = i + nb_extra_cols + 1
-                        except TypeError:
-                            msg = f"{self._fp.name} needs a text column"
-                            logger.debug(msg)
-                        else:  # remove all delimiters from text field
-                            next_row[i] = " ".join(next_row[i:j])
-                            del next_row[i + 1 : j]
-
-                    if len(next_row) == self._nc:
-                        return next_row
-                    else:
-                        msg = f"bad row in {self.path.name}: {next_row}"
-                        logger.debug(msg)
+    def iter_batches(self, batch_size=8192):
+        """Iterate over the rows of this datafile by lists of rows"""
+        rows = iter(self)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            yield batch
 
     @reset_pos
     def __str__(self):
 
         return self._f.read()
 
+    @property
+    def _f(self):
+        """Get the file object of this datafile, opening it if needed"""
+        if self._fb is None:
+            try:
+                self._fb = open(
+                    self._fp,
+                    buffering=READ_BUFFER_SIZE,
+                    encoding="utf-8",
+                )
+            except FileNotFoundError:  # path with not file scenario
+                self._fb = StringIO()
+            else:
+                advise_sequential(self._fb)
+
+        return self._fb
+
+    @_f.setter
+    def _f(self, new_f):
+        """Set the file object of this datafile"""
+        self._fb = new_f
+
     @property
     def pos(self):
         """Get the current position in this datafile"""
@@ -280,7 +472,7 @@ class DataFile:
                 fb,
                 delimiter=self._dm,
                 quoting=self._qt,
-                quotechar=self._qc,
+                quotechar=self._qc or None,
                 lineterminator=self._lt,
             )
             for row in self:
@@ -390,36 +582,63 @@ class DataFile:
         if verbose:
             logger.info(f"splitting {self._fp.name}")
             pbar = tqdm(total=self.size, unit="iB", unit_scale=True)
+            # the text layer cannot tell its position while iterated
+            raw_f = getattr(self._f, "buffer", self._f)
+            last_pos = 0
         else:
             pbar = None
 
-        buffer = {}
-        for row in self:
-            try:
-                fields = [row[col] for col in columns]
-            except IndexError:
-                logger.debug(f"missing column(s) {columns} in {row}")
-            else:
-                if all(fields):
-                    # classify the rows
-                    fname = self._get_out_filename(fields)
-                    fb = buffer.setdefault(fname, StringIO())
-                    wt = csv.writer(
-                        fb,
+        if save:  # save split files in the same parent directory
+            buffer = Buffer(
+                self._fp.parent,
+                delimiter=self._dm,
+                quoting=self._qt,
+                quotechar=self._qc,
+                lineterminator=self._lt,
+            )
+            add_row = buffer.add
+        else:
+            buffer = {}
+            writers = {}
+
+            def add_row(row, fname):
+                try:
+                    wt = writers[fname]
+                except KeyError:
+                    buffer[fname] = StringIO()
+                    wt = writers[fname] = csv.writer(
+                        buffer[fname],
                         delimiter=self._dm,
                         quoting=self._qt,
-                        quotechar=self._qc,
+                        quotechar=self._qc or None,
                         lineterminator=self._lt,
                     )
-                    wt.writerow(row)
+                wt.writerow(row)
+
+        fnames = {}  # output filenames by split fields
+        try:
+            for batch in self.iter_batches():
+                classify_rows(
+                    batch, columns, add_row, self._get_out_filename, fnames
+                )
 
-            if pbar:  # imcrement progress bar by the byte size of the row
-                pbar.update(get_byte_size(row, self._dm, self._lt))
+                if pbar:  # increment progress bar by the bytes of the batch
+                    pos = raw_f.tell()
+                    pbar.update(pos - last_pos)
+                    last_pos = pos
+
+            if save:
+                split_data = buffer.clear()
+            else:
+                split_data = buffer.values()
+        finally:
+            if save:  # no-op unless the split failed before clearing
+                buffer.discard()
 
         splits = []
-        for fname, fb in buffer.items():
+        for fp_or_fb in split_data:
             split = DataFile(
-                fb,
+                fp_or_fb,
                 delimiter=self._dm,
                 quoting=self._qt,
                 quotechar=self._qc,
@@ -427,15 +646,8 @@ class DataFile:
                 text_col=self._tc,
                 nb_cols=self._nc,
             )
-            if save:  # save split files in the same parent directory
-                try:
-                    split.save(
-                        to_path=self._fp.parent.joinpath(fname),
-                        version=self.version,
-                    )
-                except FileNotFoundError:
-                    logger.debug("split saving failed", exc_info=True)
-                    continue
+            if save and self.version:
+                split.version = self.version
             splits.append(split)
 
         if pbar:
@@ -450,7 +662,7 @@ class DataFile:
             fb,
             delimiter=self._dm,
             quoting=self._qt,
-            quotechar=self._qc,
+            quotechar=self._qc or None,
             lineterminator=self._lt,
         )
         wt.writerows(iter(self))
@@ -521,3 +733,188 @@ class DataFile:
     def version(self, new_version):
         """Set the version of this datafile"""
         version[self._fp.stem] = new_version
+
+
+class Buffer:
+    """A buffer that classifies rows by output file and appends them to
+    these files once their approximate size reaches a threshold
+    """
+
+    def __init__(
+        self,
+        out_dir,
+        delimiter="\t",
+        quoting=csv.QUOTE_NONE,
+        quotechar="",
+        lineterminator="\n",
+        max_size=4 << 20,
+        max_pending=8 << 20,
+        max_open=None,
+    ):
+        """
+        Parameters
+        ----------
+        out_dir : pathlib.Path, str
+            The directory where the output files are saved
+        delimiter : str, optional
+            the field delimiter of the output files, by default "\t"
+        quoting : csv module constant, optional
+            the field quoting rule of the output files,
+            by default csv.QUOTE_NONE
+        quotechar : str, optional
+            the character used to quote fields, by default ""
+        lineterminator : str, optional
+            the string used to terminate lines, by default "\n"
+        max_size : int, optional
+            the number of characters of the rows buffered for an output
+            file above which they are written, by default 4 Mi
+        max_pending : int, optional
+            the number of characters of all buffered rows above which
+            the largest buffers are written, by default 8 Mi
+        max_open : int, optional
+            the maximum number of output files kept open at the same
+            time, by default derived from the open file limit
+        """
+        self._dir = Path(out_dir)
+        self._dm = delimiter
+        self._qt = quoting
+        self._qc = quotechar
+        self._lt = lineterminator
+        self._max = max_size
+        self._max_pending = max_pending
+        self._max_open = max_open or get_max_open_files()
+        # the rows waiting to be written in each output file
+        self._data = {}
+        # the number of characters of these rows
+        self._sizes = {}
+        # the number of characters of all buffered rows
+        self._pending = 0
+        # the output files already written
+        self._saved = set()
+        # the open output files and their writers, least recently used first
+        self._handles = OrderedDict()
+
+    def add(self, row, out_fname):
+        """Add a row to the buffer of this output file"""
+        try:
+            data = self._data[out_fname]
+        except KeyError:  # the row lists are reused after each save
+            data = self._data[out_fname] = []
+            self._sizes[out_fname] = 0
+        data.append(row)
+        # the characters of the row once delimited and terminated
+        n = sum(map(len, row)) + len(row)
+        self._sizes[out_fname] += n
+        self._pending += n
+        if self._sizes[out_fname] > self._max:
+            self._save(out_fname)
+        elif self._pending > self._max_pending:
+            # write the largest buffers until half of the budget is free
+            while self._pending > self._max_pending // 2:
+                self._save(max(self._sizes, key=self._sizes.get))
+
+    def clear(self):
+        """Write all buffered rows and get the paths of the output files"""
+        for out_fname in self._data:
+            self._save(out_fname)
+        for f, _ in self._handles.values():
+            f.close()
+        self._handles.clear()
+
+        out_paths = []
+        if self._data:  # overlap the renaming of many output files
+            nb_workers = min(MAX_RENAME_WORKERS, len(self._data))
+            with ThreadPoolExecutor(max_workers=nb_workers) as executor:
+                out_paths = list(executor.map(self._finalize, self._data))
+
+        self._data.clear()
+        self._sizes.clear()
+        self._pending = 0
+        self._saved.clear()
+
+        return out_paths
+
+    def discard(self):
+        """Close the output files and delete them without writing the
+        buffered rows
+        """
+        for f, _ in self._handles.values():
+            f.close()
+        self._handles.clear()
+
+        for out_fname in self._saved:
+            try:
+                self._get_part_path(out_fname).unlink()
+            except FileNotFoundError:
+                pass
+
+        self._data.clear()
+        self._sizes.clear()
+        self._pending = 0
+        self._saved.clear()
+
+    def _save(self, out_fname):
+        """Append the buffered rows to a temporary output file"""
+        self._get_writer(out_fname).writerows(self._data[out_fname])
+        self._data[out_fname].clear()
+        self._pending -= self._sizes[out_fname]
+        self._sizes[out_fname] = 0
+
+    def _finalize(self, out_fname):
+        """Give its final name to a temporary output file"""
+        out_fp = self._dir.joinpath(out_fname)
+        # both files are in the same directory, so this rename is atomic
+        self._get_part_path(out_fname).replace(out_fp)
+
+        return out_fp
+
+    def _get_writer(self, out_fname):
+        """Get the csv writer of this output file. Its file stays open
+        across saves unless too many files are open.
+        """
+        if out_fname in self._handles:
+            self._handles.move_to_end(out_fname)
+            return self._handles[out_fname][1]
+
+        if len(self._handles) >= self._max_open:
+            self._close_lru()
+
+        # a new buffer overwrites any leftover of a previous run
+        mode = "a" if out_fname in self._saved else "w"
+        while True:
+            try:
+                f = open(
+                    self._get_part_path(out_fname),
+                    mode=mode,
+                    buffering=WRITE_BUFFER_SIZE,
+                    encoding="utf-8",
+                    newline="",
+                )
+            except OSError as err:
+                # other files of the process may use up the descriptors
+                if err.errno != errno.EMFILE or not self._handles:
+                    raise
+                self._close_lru()
+            else:
+                break
+        # csv rejects an empty quotechar since Python 3.11
+        wt = csv.writer(
+            f,
+            delimiter=self._dm,
+            quoting=self._qt,
+            quotechar=self._qc or None,
+            lineterminator=self._lt,
+        )
+        self._handles[out_fname] = (f, wt)
+        self._saved.add(out_fname)
+
+        return wt
+
+    def _close_lru(self):
+        """Close the least recently used output file"""
+        _, (f, _) = self._handles.popitem(last=False)
+        f.close()
+
+    def _get_part_path(self, out_fname):
+        """Get the path of the temporary version of this output file"""
+        return self._dir.joinpath(f"{out_fname}.part")
@@ -10,6 +10,7 @@ from .config import (
 from .datafile import DataFile
 from .exceptions import NotLanguage, NotLanguagePair, NotTable
 from .update import Update, check_languages, check_tables
+from .utils import lazy_property
 
 logger = logging.getLogger(__name__)
 
@@ -114,7 +115,7 @@ class Table:
 
         return self._dfile.as_dataframe(**params)
 
-    @property
+    @lazy_property
     def path(self):
         """Gzt the path of this 'Table' data file
 
@@ -178,9 +179,11 @@ class Table:
                 "all",
             )
             if self._rf:
+                # dedupe the ids in numpy before building the python set
+                sent_ids = sent_dfile.as_dataframe(usecols=[0])[0].unique()
                 new_filter = {
                     "col_index": self._flg["index"],
-                    "ok_values": set(sent_dfile.as_dataframe(usecols=[0])[0]),
+                    "ok_values": set(sent_ids.tolist()),
                     "converter": int,
                 }
                 self._rf.append(new_filter)
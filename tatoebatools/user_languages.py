@@ -4,13 +4,15 @@ from .utils import is_na
 class UserLanguage:
     """The self-reported skill level of a user in a language"""
 
+    __slots__ = ("_lg", "_skl", "_usr", "_dtl")
+
     def __init__(self, lang, skill_level, username, details):
         # the language
         self._lg = lang
         # the leval of the user in this language
-        self._skl = skill_level
+        self._skl = int(skill_level) if not is_na(skill_level) else None
         # the name of the user
-        self._usr = username
+        self._usr = username if not is_na(username) else None
         # optional comments
         self._dtl = details
 
@@ -22,12 +24,12 @@ class UserLanguage:
     @property
     def skill_level(self):
         """Get the value of this skill level"""
-        return int(self._skl) if not is_na(self._skl) else None
+        return self._skl
 
     @property
     def username(self):
         """Get the name of the user who have this language skill"""
-        return self._usr if not is_na(self._usr) else None
+        return self._usr
 
     @property
     def details(self):
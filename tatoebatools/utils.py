@@ -2,6 +2,7 @@ import bz2
 import csv
 import logging
 import math
+import os
 import tarfile
 from pathlib import Path
 
@@ -155,11 +156,16 @@ def get_endpoint(url):
     return url.rsplit("/", 1)[0]
 
 
-def get_byte_size(row, delimiter, line_terminator):
-    """Get the byte size of this row split by this delimiter."""
-    line = delimiter.join(row) + line_terminator
-
-    return len(line.encode("utf-8"))
+def advise_sequential(file_obj):
+    """Hint the kernel that this file will be read sequentially so that
+    it reads ahead more aggressively. No-op where it is not supported.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(file_obj.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except (OSError, ValueError):  # not a real file
+        logger.debug("no read-ahead advice for this file", exc_info=True)
 
 
 def get_extended_name(file_path, extension):
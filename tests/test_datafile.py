@@ -4,7 +4,14 @@ from pathlib import Path
 from unittest.mock import patch
 
 import pandas as pd
-from tatoebatools.datafile import DataFile
+import pytest
+from tatoebatools.datafile import (
+    Buffer,
+    DataFile,
+    custom_reader,
+    get_max_open_files,
+    split_lines,
+)
 
 
 class TestDataFileInit:
@@ -29,6 +36,13 @@ class TestDataFileInit:
         dfile = DataFile(fp, **self.params)
         assert str(dfile) == ""
 
+    def test_crlf_path_arg(self, tmp_path):
+        fp = tmp_path.joinpath("file.csv")
+        fp.write_bytes(self.data.replace("\n", "\r\n").encode())
+        dfile = DataFile(fp, **self.params)
+        assert str(dfile) == self.data
+        assert dfile.as_dataframe().iloc[0, 2] == "c"
+
     def test_dataframe_arg(self):
         dframe = pd.DataFrame([["a", "b", "c"], ["d", "e", "f"]])
         dfile = DataFile(dframe, **self.params)
@@ -43,6 +57,12 @@ class TestDataFileIterator:
 
     delimiters = ("\t", ",")
 
+    def test_temporary_datafile(self, tmp_path):
+        fp = tmp_path.joinpath("file.tsv")
+        fp.write_text("a\tb\nc\td\n")
+        assert [row for row in DataFile(fp)] == [["a", "b"], ["c", "d"]]
+        assert next(iter(DataFile(fp))) == ["a", "b"]
+
     def test_empty(self):
         for dm in self.delimiters:
             dfile = DataFile("", delimiter=dm)
@@ -115,6 +135,63 @@ class TestDataFileIterator:
             assert out_rows == in_rows
 
 
+class TestSplitLines:
+    def test_rows(self):
+        rows = split_lines(StringIO("a\tb\tc\r\nd\te\n"))
+        assert list(rows) == [["a", "b", "c"], ["d", "e"]]
+
+    def test_blank_line(self):
+        rows = split_lines(StringIO("a\tb\n\nc\td\n"))
+        assert list(rows) == [["a", "b"], [], ["c", "d"]]
+
+    def test_maxsplit(self):
+        rows = split_lines(StringIO("a\tb\tc\td\n"), maxsplit=2)
+        assert list(rows) == [["a", "b", "c\td"]]
+
+
+class TestCustomReader:
+
+    params = {"nb_cols": 3, "text_col": 2}
+
+    def test_extra_delimiters_in_last_column(self):
+        f = StringIO("1\tfra\ta\tb\tc\n")
+        rows = custom_reader(f, **self.params)
+        assert list(rows) == [["1", "fra", "a b c"]]
+
+    def test_multiline_text_in_last_column(self):
+        f = StringIO("1\tfra\ta\nb\n2\teng\tc\n")
+        rows = custom_reader(f, **self.params)
+        assert list(rows) == [["1", "fra", "a b"], ["2", "eng", "c"]]
+
+    def test_multiline_text_with_extra_delimiters(self):
+        f = StringIO("1\tfra\ta\tb\nc\n")
+        rows = custom_reader(f, **self.params)
+        assert list(rows) == [["1", "fra", "a b"]]
+
+    def test_fragment_before_long_row(self):
+        f = StringIO("x\n2\tfra\ta\tb\tc\n")
+        rows = custom_reader(f, **self.params)
+        assert list(rows) == [["2", "fra", "a b c"]]
+
+    def test_blank_lines(self):
+        f = StringIO("1\tfra\ta\n\n2\teng\tb\n\n")
+        rows = custom_reader(f, **self.params)
+        assert list(rows) == [["1", "fra", "a"], ["2", "eng", "b"]]
+
+
+class TestDataFileIterBatches:
+    def test_empty(self):
+        dfile = DataFile("", delimiter=",")
+        assert list(dfile.iter_batches()) == []
+
+    def test_batches(self):
+        dfile = DataFile("a,b\nc,d\ne,f\n", delimiter=",")
+        assert list(dfile.iter_batches(batch_size=2)) == [
+            [["a", "b"], ["c", "d"]],
+            [["e", "f"]],
+        ]
+
+
 class TestDataFileAsDataFrame:
 
     delimiters = ("\t", ",")
@@ -187,3 +264,155 @@ class TestDataFileJoin:
         other_dfile = DataFile("a,b\nc,d\ne,f", **self.params)
         join_dfile = dfile.join(other_dfile, index_col=[0], on_col=[0])
         assert str(join_dfile) == "a,b,c,b\n"
+
+
+class TestDataFileSplit:
+
+    data = "1,eng,foo\n2,fra,bar\n3,eng,baz\n4,,qux\n"
+    params = {"delimiter": ",", "nb_cols": 3, "text_col": 2}
+
+    def test_split_without_save(self, tmp_path):
+        fp = tmp_path.joinpath("queries.csv")
+        fp.write_text(self.data)
+        dfile = DataFile(fp, **self.params)
+        splits = dfile.split(columns=[1], verbose=False, save=False)
+
+        assert [str(s) for s in splits] == [
+            "1,eng,foo\n3,eng,baz\n",
+            "2,fra,bar\n",
+        ]
+
+    def test_split_with_save(self, tmp_path):
+        fp = tmp_path.joinpath("queries.csv")
+        fp.write_text(self.data)
+        dfile = DataFile(fp, **self.params)
+        splits = dfile.split(columns=[1], verbose=False, save=True)
+
+        assert [s.path.name for s in splits] == [
+            "eng_queries.csv",
+            "fra_queries.csv",
+        ]
+        assert [str(s) for s in splits] == [
+            "1,eng,foo\n3,eng,baz\n",
+            "2,fra,bar\n",
+        ]
+        assert not list(tmp_path.glob("*.part"))
+
+    def test_split_files_not_left_open(self, tmp_path):
+        fp = tmp_path.joinpath("queries.csv")
+        fp.write_text(self.data)
+        dfile = DataFile(fp, **self.params)
+        splits = dfile.split(columns=[1], verbose=False, save=True)
+
+        assert all(s._fb is None for s in splits)
+
+    @patch("tatoebatools.datafile.Path.replace", side_effect=OSError)
+    def test_split_failure(self, m_replace, tmp_path):
+        fp = tmp_path.joinpath("queries.csv")
+        fp.write_text(self.data)
+        dfile = DataFile(fp, **self.params)
+        with pytest.raises(OSError):
+            dfile.split(columns=[1], verbose=False, save=True)
+
+        assert not list(tmp_path.glob("*.part"))
+
+    def test_split_by_several_columns(self, tmp_path):
+        fp = tmp_path.joinpath("queries.csv")
+        fp.write_text(self.data)
+        dfile = DataFile(fp, **self.params)
+        splits = dfile.split(columns=[1, 0], verbose=False, save=False)
+
+        assert [str(s) for s in splits] == [
+            "1,eng,foo\n",
+            "2,fra,bar\n",
+            "3,eng,baz\n",
+        ]
+
+
+class TestBuffer:
+
+    params = {"delimiter": ","}
+
+    def test_add_below_max_size(self, tmp_path):
+        buffer = Buffer(tmp_path, **self.params)
+        buffer.add(["a", "b"], "out.csv")
+
+        assert not list(tmp_path.iterdir())
+
+    def test_add_above_max_size(self, tmp_path):
+        buffer = Buffer(tmp_path, max_size=4, **self.params)
+        buffer.add(["a", "b"], "out.csv")
+        buffer.add(["c", "d"], "out.csv")
+
+        assert tmp_path.joinpath("out.csv.part").exists()
+
+    def test_add_above_max_pending(self, tmp_path):
+        buffer = Buffer(tmp_path, max_pending=8, **self.params)
+        buffer.add(["a", "b"], "out1.csv")
+        buffer.add(["ccc", "d"], "out2.csv")
+
+        assert tmp_path.joinpath("out2.csv.part").exists()
+        assert not tmp_path.joinpath("out1.csv.part").exists()
+
+    def test_add_above_max_open(self, tmp_path):
+        buffer = Buffer(tmp_path, max_size=0, max_open=1, **self.params)
+        buffer.add(["a", "b"], "out1.csv")
+        buffer.add(["c", "d"], "out2.csv")
+        buffer.add(["e", "f"], "out1.csv")
+
+        assert tmp_path.joinpath("out2.csv.part").read_text() == "c,d\n"
+        assert buffer.clear() == [
+            tmp_path.joinpath("out1.csv"),
+            tmp_path.joinpath("out2.csv"),
+        ]
+        assert tmp_path.joinpath("out1.csv").read_text() == "a,b\ne,f\n"
+
+    def test_add_above_open_file_limit(self, tmp_path):
+        buffer = Buffer(tmp_path, max_size=0, **self.params)
+        buffer.add(["a", "b"], "out1.csv")
+        emfile = OSError(24, "Too many open files")
+        with patch(
+            "builtins.open", side_effect=[emfile, StringIO()]
+        ) as m_open:
+            buffer.add(["c", "d"], "out2.csv")
+
+        assert m_open.call_count == 2
+        assert list(buffer._handles) == ["out2.csv"]
+
+    def test_discard(self, tmp_path):
+        buffer = Buffer(tmp_path, max_size=0, **self.params)
+        buffer.add(["a", "b"], "out.csv")
+        buffer.discard()
+
+        assert not list(tmp_path.iterdir())
+        assert buffer.clear() == []
+
+    def test_clear(self, tmp_path):
+        tmp_path.joinpath("out.csv.part").write_text("old,row\n")
+        buffer = Buffer(tmp_path, max_size=4, **self.params)
+        buffer.add(["a", "b"], "out.csv")
+        buffer.add(["c", "d"], "out.csv")
+        buffer.add(["e", "f"], "out.csv")
+        out_paths = buffer.clear()
+
+        assert out_paths == [tmp_path.joinpath("out.csv")]
+        assert out_paths[0].read_text() == "a,b\nc,d\ne,f\n"
+        assert not tmp_path.joinpath("out.csv.part").exists()
+
+
+class TestGetMaxOpenFiles:
+    @patch("tatoebatools.datafile.resource")
+    def test_low_limit(self, m_resource):
+        m_resource.getrlimit.return_value = (256, 4096)
+
+        assert get_max_open_files() == 192
+
+    @patch("tatoebatools.datafile.resource")
+    def test_high_limit(self, m_resource):
+        m_resource.getrlimit.return_value = (65536, 65536)
+
+        assert get_max_open_files() == 512
+
+    @patch("tatoebatools.datafile.resource", None)
+    def test_no_resource_module(self):
+        assert get_max_open_files() == 512
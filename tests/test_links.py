@@ -0,0 +1,22 @@
+import pytest
+from tatoebatools.config import TABLE_CSV_PARAMS
+from tatoebatools.links import Link
+from tatoebatools.utils import list_attributes
+
+
+class TestLink:
+    def test_init(self):
+        link = Link("1", "77")
+
+        assert link.sentence_id == 1
+        assert link.translation_id == 77
+
+    def test_slots(self):
+        link = Link("1", "77")
+
+        with pytest.raises(AttributeError):
+            link.foo = "bar"
+
+    def test_attributes(self):
+        assert list_attributes(Link) == ["sentence_id", "translation_id"]
+        assert TABLE_CSV_PARAMS["links"]["nb_cols"] == 2
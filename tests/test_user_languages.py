@@ -0,0 +1,36 @@
+import pytest
+from tatoebatools.config import TABLE_CSV_PARAMS
+from tatoebatools.user_languages import UserLanguage
+from tatoebatools.utils import list_attributes
+
+
+class TestUserLanguage:
+    def test_init(self):
+        user_language = UserLanguage("fra", "4", "foo", "bar")
+
+        assert user_language.lang == "fra"
+        assert user_language.skill_level == 4
+        assert user_language.username == "foo"
+        assert user_language.details == "bar"
+
+    def test_init_not_available(self):
+        user_language = UserLanguage("fra", "\\N", "\\N", "")
+
+        assert user_language.skill_level is None
+        assert user_language.username is None
+        assert user_language.details == ""
+
+    def test_slots(self):
+        user_language = UserLanguage("fra", "4", "foo", "bar")
+
+        with pytest.raises(AttributeError):
+            user_language.foo = "bar"
+
+    def test_attributes(self):
+        assert list_attributes(UserLanguage) == [
+            "lang",
+            "skill_level",
+            "username",
+            "details",
+        ]
+        assert TABLE_CSV_PARAMS["user_languages"]["nb_cols"] == 4
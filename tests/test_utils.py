@@ -1,9 +1,16 @@
+from io import StringIO
 from pathlib import Path
 from tarfile import ReadError
 from unittest.mock import patch
 
 from requests.exceptions import RequestException
-from tatoebatools.utils import decompress, download, extract, fetch
+from tatoebatools.utils import (
+    advise_sequential,
+    decompress,
+    download,
+    extract,
+    fetch,
+)
 
 
 class TestDownload:
@@ -145,3 +152,20 @@ class TestFetch:
         m_download.return_value = None
 
         assert fetch("any_url", "any_dir") == []
+
+
+class TestAdviseSequential:
+    @patch("tatoebatools.utils.os.posix_fadvise", create=True)
+    def test_with_file(self, m_fadvise, tmp_path):
+        fp = tmp_path.joinpath("file.tsv")
+        fp.write_text("a\tb\n")
+        with open(fp) as f:
+            advise_sequential(f)
+
+        assert m_fadvise.call_count == 1
+
+    @patch("tatoebatools.utils.os.posix_fadvise", create=True)
+    def test_with_file_like_object(self, m_fadvise):
+        advise_sequential(StringIO("a\tb\n"))
+
+        assert m_fadvise.call_count == 0